@@ -221,7 +221,13 @@ class GridEngine:
             except Exception as e:
                 logger.error(f"保存策略 {strategy_id} 最终状态时出错: {e}")
         
-        # 4. 最后关闭交易所连接
+        # 4. 写入尚未落盘的交易记录
+        try:
+            await self.trade_recorder.close()
+        except Exception as e:
+            logger.error(f"写入交易记录时出错: {e}", exc_info=True)
+        
+        # 5. 最后关闭交易所连接
         try:
             await self.exchange_manager.close()
             logger.info("所有交易所连接已关闭")
@@ -17,9 +17,14 @@ from girdbot.utils.logger import get_logger
 
 logger = get_logger("grid_strategy")
 
+# 已有挂单、等待成交的级别状态，更新网格订单时直接跳过
+_PENDING_STATUSES = frozenset({"BUYING", "SELLING"})
+
 class GridLevel:
     """网格级别，表示网格中的一个价格点位"""
     
+    __slots__ = ('id', 'price', 'amount', 'buy_order_id', 'sell_order_id', 'status', 'last_update')
+    
     def __init__(self, id: str, price: Decimal, amount: Decimal, 
                  buy_order_id: Optional[str] = None,
                  sell_order_id: Optional[str] = None):
@@ -124,6 +129,8 @@ class GridStrategy:
         self.initialized = False
         self.running = False
         self.grid_levels_data: List[GridLevel] = []
+        self._levels_by_id: Dict[str, GridLevel] = {}  # 级别ID -> 网格级别
+        self._exchange_precision: Optional[Tuple[Decimal, Decimal]] = None  # 交易所精度缓存(价格, 数量)
         self.order_manager = OrderManager()
         
         # 统计数据
@@ -267,8 +274,13 @@ class GridStrategy:
             level = GridLevel(level_id, price, amount)
             self.grid_levels_data.append(level)
             
+        self._index_levels()
         logger.info(f"创建了 {len(self.grid_levels_data)} 个网格点位")
     
+    def _index_levels(self):
+        """重建级别ID到网格级别的索引"""
+        self._levels_by_id = {level.id: level for level in self.grid_levels_data}
+    
     async def check_order_status(self):
         """检查所有订单的状态"""
         # 获取所有活跃订单ID
@@ -298,20 +310,28 @@ class GridStrategy:
     async def update_grid_orders(self, current_price):
         """根据当前价格更新网格订单"""
         for level in self.grid_levels_data:
+            # 状态只读取一次，后续分支都使用局部变量
+            status = level.status
+            
+            # 运行中大部分级别都在挂单，一次集合查找即可跳过
+            if status in _PENDING_STATUSES:
+                continue
+                
             # 根据级别状态和当前价格决定操作
-            if level.status == "READY":
+            if status == "READY":
                 # 准备状态 - 如果价格低于网格价格，创建买单
-                if current_price < level.price:
+                price = level.price
+                if current_price < price:
                     await self.place_buy_order(level)
                 # 如果价格高于网格价格，创建卖单
-                elif current_price > level.price:
+                elif current_price > price:
                     await self.place_sell_order(level)
             
-            elif level.status == "BOUGHT" and not level.sell_order_id:
+            elif status == "BOUGHT" and not level.sell_order_id:
                 # 已买入但没有卖单 - 创建卖单
                 await self.place_sell_order(level)
                 
-            elif level.status == "SOLD" and not level.buy_order_id:
+            elif status == "SOLD" and not level.buy_order_id:
                 # 已卖出但没有买单 - 创建买单
                 await self.place_buy_order(level)
     
@@ -450,7 +470,7 @@ class GridStrategy:
         self.order_manager.update_order(order_id, order_data)
         
         # 更新网格级别状态
-        level = next((l for l in self.grid_levels_data if l.id == level_id), None)
+        level = self._levels_by_id.get(level_id)
         if not level:
             logger.warning(f"找不到网格级别: {level_id}")
             return
@@ -498,7 +518,7 @@ class GridStrategy:
         self.order_manager.update_order(order_id, order_data)
         
         # 更新网格级别状态
-        level = next((l for l in self.grid_levels_data if l.id == level_id), None)
+        level = self._levels_by_id.get(level_id)
         if not level:
             logger.warning(f"找不到网格级别: {level_id}")
             return
@@ -598,6 +618,10 @@ class GridStrategy:
     
     async def get_exchange_precision(self) -> Tuple[Decimal, Decimal]:
         """获取交易所的精度(价格和数量)"""
+        # 交易对精度在运行期间不变，成功获取一次后直接复用
+        if self._exchange_precision is not None:
+            return self._exchange_precision
+            
         try:
             # 使用正确的方法名 fetch_market_info 而不是 load_market
             market_info = await self.primary_exchange.fetch_market_info(self.trading_pair)
@@ -611,7 +635,8 @@ class GridStrategy:
                 # 提供一个默认的高精度值，避免程序崩溃
                 return (Decimal("0.00000001"), Decimal("0.00000001"))
 
-            return (Decimal(str(price_precision_val)), Decimal(str(amount_precision_val)))
+            self._exchange_precision = (Decimal(str(price_precision_val)), Decimal(str(amount_precision_val)))
+            return self._exchange_precision
         except Exception as e:
             logger.error(f"获取交易所精度时发生未知错误: {e}", exc_info=True)
             # 异常情况下也返回默认值
@@ -652,6 +677,7 @@ class GridStrategy:
             # 恢复网格级别
             grid_levels = state.get("grid_levels", [])
             self.grid_levels_data = [GridLevel.from_dict(level_data) for level_data in grid_levels]
+            self._index_levels()
             
             # 恢复订单管理器
             orders = state.get("orders", {})
@@ -684,7 +710,7 @@ class GridStrategy:
             # 返回原始值或根据业务逻辑处理
             return value
             
-        return (value / precision).quantize(Decimal('1'), rounding=ROUND_DOWN) * precision
+        return round_to_precision(value, precision, ROUND_DOWN)
     
     def get_status(self):
         """获取策略状态信息"""
@@ -8,11 +8,18 @@ from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 
 from girdbot.exchange.exchange_manager import ExchangeManager
-from girdbot.utils.helpers import round_to_precision
+from girdbot.utils.helpers import (
+    round_to_precision,
+    calculate_price_precision,
+    calculate_amount_precision,
+)
 from girdbot.utils.logger import get_logger
 
 logger = get_logger("hedge_manager")
 
+# 交易方向 -> 对冲方向
+_OPPOSITE_SIDE = {"buy": "sell", "sell": "buy"}
+
 class HedgeManager:
     """对冲管理器，负责处理对冲交易逻辑"""
     
@@ -27,6 +34,7 @@ class HedgeManager:
         self.hedge_strategies: Dict[str, Dict] = {}  # 策略ID -> 对冲配置
         self.hedge_orders: Dict[str, Dict] = {}  # 原始订单ID -> 对冲订单信息
         self.reverse_lookup: Dict[str, str] = {}  # 对冲订单ID -> 原始订单ID
+        self._precision_loaded: set = set()  # 已从交易所获取过精度信息的策略ID
     
     async def initialize_for_strategy(self, strategy):
         """
@@ -53,6 +61,7 @@ class HedgeManager:
             "initialized": True,
             "last_update": time.time()
         }
+        self._precision_loaded.discard(strategy_id)
         
         logger.info(f"策略 {strategy_id} 对冲模式已初始化，对冲交易所: {[ex.name for ex in hedge_exchanges]}")
         return True
@@ -82,7 +91,7 @@ class HedgeManager:
         hedge_exchanges = hedge_config["exchanges"]
         
         # 对冲需要反向交易
-        hedge_side = "sell" if side == "buy" else "buy"
+        hedge_side = _OPPOSITE_SIDE[side]
         
         # 获取交易所精度要求
         if hedge_exchanges and len(hedge_exchanges) > 0:
@@ -269,6 +278,10 @@ class HedgeManager:
             exchange: 交易所实例
             trading_pair: 交易对
         """
+        # 交易对精度不会随订单变化，每个策略只需获取一次
+        if strategy_id in self._precision_loaded:
+            return
+            
         hedge_config = self.hedge_strategies[strategy_id]
         
         try:
@@ -276,11 +289,9 @@ class HedgeManager:
             market_info = await exchange.fetch_market_info(trading_pair)
             
             # 更新精度信息
-            price_precision = Decimal(f"0.{'0' * (market_info.get('precision', {}).get('price', 8) - 1)}1")
-            amount_precision = Decimal(f"0.{'0' * (market_info.get('precision', {}).get('amount', 8) - 1)}1")
-            
-            hedge_config["price_precision"] = price_precision
-            hedge_config["amount_precision"] = amount_precision
+            hedge_config["price_precision"] = calculate_price_precision(market_info)
+            hedge_config["amount_precision"] = calculate_amount_precision(market_info)
+            self._precision_loaded.add(strategy_id)
             
         except Exception as e:
             logger.error(f"获取交易所精度信息失败: {e}")
@@ -16,6 +16,8 @@ logger = get_logger("binance_future")
 class BinanceFutureExchange(ExchangeBase):
     """币安合约交易所接口"""
     
+    __slots__ = ()
+    
     def __init__(self, api_key: str, api_secret: str, account_alias: str = None, testnet: bool = False):
         """
         初始化币安合约接口
@@ -57,15 +59,7 @@ class BinanceFutureExchange(ExchangeBase):
             self.symbols = self.exchange.symbols
             
             # 提取交易规则
-            for symbol, market in self.markets.items():
-                self.trading_rules[symbol] = {
-                    'min_price': market.get('limits', {}).get('price', {}).get('min'),
-                    'max_price': market.get('limits', {}).get('price', {}).get('max'),
-                    'min_amount': market.get('limits', {}).get('amount', {}).get('min'),
-                    'max_amount': market.get('limits', {}).get('amount', {}).get('max'),
-                    'min_notional': market.get('limits', {}).get('cost', {}).get('min'),
-                    'precision': market.get('precision', {})
-                }
+            self._update_trading_rules()
             
             # 设置对冲模式
             try:
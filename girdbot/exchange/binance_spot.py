@@ -16,6 +16,8 @@ logger = get_logger("binance_spot")
 class BinanceSpotExchange(ExchangeBase):
     """币安现货交易所接口"""
     
+    __slots__ = ()
+    
     def __init__(self, api_key: str, api_secret: str, account_alias: str = None, testnet: bool = False):
         """
         初始化币安现货接口
@@ -56,15 +58,7 @@ class BinanceSpotExchange(ExchangeBase):
             self.symbols = self.exchange.symbols
             
             # 提取交易规则
-            for symbol, market in self.markets.items():
-                self.trading_rules[symbol] = {
-                    'min_price': market.get('limits', {}).get('price', {}).get('min'),
-                    'max_price': market.get('limits', {}).get('price', {}).get('max'),
-                    'min_amount': market.get('limits', {}).get('amount', {}).get('min'),
-                    'max_amount': market.get('limits', {}).get('amount', {}).get('max'),
-                    'min_notional': market.get('limits', {}).get('cost', {}).get('min'),
-                    'precision': market.get('precision', {})
-                }
+            self._update_trading_rules()
             
             # 测试API权限
             await self.exchange.fetch_balance()
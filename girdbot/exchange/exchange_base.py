@@ -9,6 +9,12 @@ from typing import Dict, List, Optional, Union, Any
 class ExchangeBase(ABC):
     """交易所基类，定义所有交易所共有的接口方法"""
     
+    # 实例属性固定，使用__slots__省去每个实例的__dict__
+    __slots__ = (
+        'api_key', 'api_secret', 'name', 'id', 'account_alias', 'initialized',
+        'markets', 'trading_rules', 'symbols', 'exchange'
+    )
+    
     def __init__(self, api_key: str, api_secret: str, name: str, account_alias: str = None):
         """
         初始化交易所基类
@@ -28,6 +34,7 @@ class ExchangeBase(ABC):
         self.markets = {}
         self.trading_rules = {}
         self.symbols = []
+        self.exchange = None  # CCXT交易所实例，由子类创建
     
     @abstractmethod
     async def initialize(self):
@@ -320,6 +327,28 @@ class ExchangeBase(ABC):
         """
         raise NotImplementedError("fetch_my_trades方法未实现")
     
+    async def refresh_markets(self):
+        """
+        重新加载市场信息并刷新交易规则缓存
+        """
+        self.markets = await self.exchange.load_markets(reload=True)
+        self.symbols = list(self.markets.keys())
+        self._update_trading_rules()
+    
+    def _update_trading_rules(self):
+        """
+        从市场信息中提取交易规则
+        """
+        for symbol, market in self.markets.items():
+            self.trading_rules[symbol] = {
+                'min_price': market.get('limits', {}).get('price', {}).get('min'),
+                'max_price': market.get('limits', {}).get('price', {}).get('max'),
+                'min_amount': market.get('limits', {}).get('amount', {}).get('min'),
+                'max_amount': market.get('limits', {}).get('amount', {}).get('max'),
+                'min_notional': market.get('limits', {}).get('cost', {}).get('min'),
+                'precision': market.get('precision', {})
+            }
+    
     def get_market_info(self, symbol: str) -> Dict[str, Any]:
         """
         从缓存获取市场信息
@@ -24,6 +24,10 @@ class ExchangeManager:
         self.exchange_configs = exchange_configs
         self.exchanges: Dict[str, ExchangeBase] = {}
         self.primary_exchange: Optional[ExchangeBase] = None
+        
+        # 名称/别名 -> 交易所实例的索引，在初始化完成后构建
+        self._by_name: Dict[str, ExchangeBase] = {}
+        self._by_alias: Dict[str, ExchangeBase] = {}
     
     async def initialize(self):
         """
@@ -85,6 +89,8 @@ class ExchangeManager:
             self.primary_exchange = self.exchanges[first_exchange_id]
             logger.info(f"未指定主交易所，使用 {first_exchange_id} 作为主交易所")
         
+        self._rebuild_indexes()
+        
         logger.info(f"交易所管理器初始化完成，共 {len(self.exchanges)} 个交易所连接")
     
     async def close(self):
@@ -109,9 +115,21 @@ class ExchangeManager:
         # 清空交易所列表
         self.exchanges.clear()
         self.primary_exchange = None
+        self._rebuild_indexes()
         
         logger.info("所有交易所连接已关闭")
     
+    def _rebuild_indexes(self):
+        """
+        重建名称和别名索引，交易所列表变化后调用
+        """
+        self._by_name = {}
+        self._by_alias = {}
+        for exchange in self.exchanges.values():
+            # 同名/同别名时保留第一个，与按顺序查找的结果一致
+            self._by_name.setdefault(exchange.name, exchange)
+            self._by_alias.setdefault(exchange.account_alias, exchange)
+    
     def get_exchange(self, exchange_id: str) -> Optional[ExchangeBase]:
         """
         获取指定ID的交易所实例
@@ -134,10 +152,7 @@ class ExchangeManager:
         Returns:
             交易所实例或None
         """
-        for exchange in self.exchanges.values():
-            if exchange.name == exchange_name:
-                return exchange
-        return None
+        return self._by_name.get(exchange_name)
     
     def get_primary_exchange(self) -> Optional[ExchangeBase]:
         """
@@ -253,10 +268,7 @@ class ExchangeManager:
         Returns:
             交易所实例或None
         """
-        for exchange in self.exchanges.values():
-            if exchange.account_alias == account_alias:
-                return exchange
-        return None
+        return self._by_alias.get(account_alias)
     
     def get_exchange_status(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -280,17 +292,11 @@ class ExchangeManager:
         """
         刷新所有交易所的市场信息
         """
-        refresh_tasks = []
-        for exchange in self.exchanges.values():
-            # 假设交易所实例有refresh_markets方法，如果没有可以移除此功能
-            if hasattr(exchange, 'refresh_markets'):
-                refresh_tasks.append(exchange.refresh_markets())
-            # 或者使用通用方法
-            elif hasattr(exchange.exchange, 'load_markets'):
-                refresh_tasks.append(exchange.exchange.load_markets(reload=True))
-        
-        if refresh_tasks:
-            await asyncio.gather(*refresh_tasks, return_exceptions=True)
+        if self.exchanges:
+            await asyncio.gather(
+                *(exchange.refresh_markets() for exchange in self.exchanges.values()),
+                return_exceptions=True
+            )
             logger.info("所有交易所市场信息已刷新")
     
     def to_dict(self) -> Dict[str, Any]:
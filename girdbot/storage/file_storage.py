@@ -10,6 +10,12 @@ from typing import Dict, Any, Optional
 import aiofiles
 from girdbot.utils.logger import get_logger
 
+# 优先使用orjson进行JSON编解码，未安装时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger("file_storage")
 
 class FileStorage:
@@ -44,13 +50,51 @@ class FileStorage:
         """
         return os.path.join(self.data_dir, filename)
     
-    async def save_json(self, filename: str, data: Dict[str, Any]) -> bool:
+    @staticmethod
+    def dumps(data: Any, pretty: bool = False) -> bytes:
+        """
+        序列化数据为UTF-8编码的JSON
+        
+        Args:
+            data: 要序列化的数据
+            pretty: 是否缩进格式化输出
+            
+        Returns:
+            JSON字节串
+        """
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(data, default=str, option=option)
+            
+        if pretty:
+            return json.dumps(data, indent=2, default=str).encode('utf-8')
+        return json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+    
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        """
+        解析JSON数据
+        
+        Args:
+            data: JSON字节串或字符串
+            
+        Returns:
+            解析后的数据
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    async def save_json(self, filename: str, data: Dict[str, Any], pretty: bool = False) -> bool:
         """
         将数据保存为JSON文件
         
         Args:
             filename: 文件名
             data: 要保存的数据
+            pretty: 是否缩进格式化输出(默认紧凑格式，便于调试时可开启)
             
         Returns:
             是否成功保存
@@ -65,8 +109,8 @@ class FileStorage:
         async with self._file_locks[file_path]:
             try:
                 # 先写入临时文件
-                async with aiofiles.open(temp_file, 'w') as f:
-                    await f.write(json.dumps(data, indent=2, default=str))
+                async with aiofiles.open(temp_file, 'wb') as f:
+                    await f.write(self.dumps(data, pretty))
                 
                 # 然后原子地重命名替换原文件
                 shutil.move(temp_file, file_path)
@@ -102,9 +146,9 @@ class FileStorage:
             
         async with self._file_locks[file_path]:
             try:
-                async with aiofiles.open(file_path, 'r') as f:
+                async with aiofiles.open(file_path, 'rb') as f:
                     content = await f.read()
-                    return json.loads(content)
+                    return self.loads(content)
             except Exception as e:
                 logger.error(f"加载JSON文件 {filename} 失败: {e}")
                 return None
@@ -125,19 +169,39 @@ class FileStorage:
             return None
             
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return self.loads(f.read())
         except Exception as e:
             logger.error(f"同步加载JSON文件 {filename} 失败: {e}")
             return None
     
-    def save_json_sync(self, filename: str, data: Dict[str, Any]) -> bool:
+    def save_json_sync(self, filename: str, data: Dict[str, Any], pretty: bool = False) -> bool:
         """
         同步将数据保存为JSON文件
         
         Args:
             filename: 文件名
             data: 要保存的数据
+            pretty: 是否缩进格式化输出(默认紧凑格式，便于调试时可开启)
+            
+        Returns:
+            是否成功保存
+        """
+        try:
+            payload = self.dumps(data, pretty)
+        except Exception as e:
+            logger.error(f"同步保存JSON文件 {filename} 失败: {e}")
+            return False
+            
+        return self.save_bytes_sync(filename, payload)
+    
+    def save_bytes_sync(self, filename: str, payload: bytes) -> bool:
+        """
+        同步将已序列化的数据写入文件
+        
+        Args:
+            filename: 文件名
+            payload: 要写入的字节串
             
         Returns:
             是否成功保存
@@ -147,14 +211,14 @@ class FileStorage:
         
         try:
             # 先写入临时文件
-            with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(temp_file, 'wb') as f:
+                f.write(payload)
             
             # 然后原子地重命名替换原文件
             shutil.move(temp_file, file_path)
             return True
         except Exception as e:
-            logger.error(f"同步保存JSON文件 {filename} 失败: {e}")
+            logger.error(f"同步保存文件 {filename} 失败: {e}")
             # 清理临时文件
             if os.path.exists(temp_file):
                 try:
@@ -163,6 +227,58 @@ class FileStorage:
                     pass
             return False
     
+    def append_lines(self, filename: str, lines: list) -> bool:
+        """
+        向文件末尾追加多行数据(用于NDJSON追加日志)
+        
+        Args:
+            filename: 文件名
+            lines: 要追加的字节串列表(不含换行符)
+            
+        Returns:
+            是否成功追加
+        """
+        file_path = self.get_file_path(filename)
+        
+        try:
+            with open(file_path, 'ab', buffering=8192) as f:
+                f.write(b''.join(line + b'\n' for line in lines))
+            return True
+        except Exception as e:
+            logger.error(f"追加写入文件 {filename} 失败: {e}")
+            return False
+    
+    def load_json_lines(self, filename: str) -> list:
+        """
+        逐行读取NDJSON文件
+        
+        Args:
+            filename: 文件名
+            
+        Returns:
+            解析后的记录列表，文件不存在时返回空列表
+        """
+        file_path = self.get_file_path(filename)
+        
+        if not os.path.exists(file_path):
+            return []
+            
+        records = []
+        try:
+            with open(file_path, 'rb') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(self.loads(line))
+                    except ValueError:
+                        # 进程中断时最后一行可能只写了一半，跳过即可
+                        logger.warning(f"跳过文件 {filename} 第 {line_no} 行的损坏记录")
+        except Exception as e:
+            logger.error(f"读取文件 {filename} 失败: {e}")
+        return records
+    
     def list_files(self, pattern: str = None) -> list:
         """
         列出目录中的文件
@@ -3,14 +3,19 @@
 """
 import os
 import time
+import shutil
 from typing import Dict, Any, Optional, List
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 from girdbot.storage.file_storage import FileStorage
 from girdbot.utils.logger import get_logger
 
 logger = get_logger("grid_state")
 
+# 每次保存都会变化、不参与变更检测的字段
+_VOLATILE_KEYS = frozenset({"last_update", "_last_saved"})
+
 class GridStateManager:
     """
     网格状态管理器，处理网格策略状态的保存、加载和恢复
@@ -26,8 +31,22 @@ class GridStateManager:
         self.data_dir = data_dir
         self.storage = FileStorage(os.path.join(data_dir, "grid_states"))
         self.start_time = time.time()
-        self._last_save_time = {}
+        self._last_save_time: Dict[str, float] = {}  # 策略ID -> 上次保存的单调时钟时间
         self._save_interval = 5  # 状态保存最小间隔(秒)
+        self._last_state_hash: Dict[str, int] = {}  # 策略ID -> 上次保存内容的哈希
+        
+        # 已保存状态的策略ID，启动时扫描一次目录，之后随保存/删除更新
+        self._known_strategies = set(self._scan_dir())
+    
+    def _scan_dir(self) -> List[str]:
+        """
+        扫描存储目录中的网格状态文件
+        
+        Returns:
+            策略ID列表
+        """
+        files = self.storage.list_files("*.json")
+        return [f[:-len(".json")] for f in files if not f.startswith("system_status")]
     
     def save_grid_state(self, strategy_id: str, state: Dict[str, Any]) -> bool:
         """
@@ -40,25 +59,36 @@ class GridStateManager:
         Returns:
             是否成功保存
         """
-        # 避免过于频繁的保存
-        current_time = time.time()
-        last_save = self._last_save_time.get(strategy_id, 0)
+        # 避免过于频繁的保存(使用单调时钟，不受系统时间调整影响)
+        now = time.monotonic()
+        last_save = self._last_save_time.get(strategy_id)
         
-        if current_time - last_save < self._save_interval:
+        if last_save is not None and now - last_save < self._save_interval:
+            return True
+            
+        # 状态内容与上次保存时相同则跳过写入
+        content = self.storage.dumps({k: v for k, v in state.items() if k not in _VOLATILE_KEYS})
+        state_hash = hash(content)
+        if state_hash == self._last_state_hash.get(strategy_id):
+            self._last_save_time[strategy_id] = now
             return True
             
         filename = f"{strategy_id}.json"
         
-        # 添加保存时间戳
-        state_copy = state.copy()
-        state_copy["_last_saved"] = current_time
+        # 将易变字段和保存时间戳拼接到已序列化的内容末尾，无需复制整个状态字典
+        volatile = {k: state[k] for k in _VOLATILE_KEYS if k in state}
+        volatile["_last_saved"] = time.time()
+        trailer = self.storage.dumps(volatile)
+        payload = content[:-1] + b',' + trailer[1:] if content != b'{}' else trailer
         
         # 同步保存状态
-        result = self.storage.save_json_sync(filename, state_copy)
+        result = self.storage.save_bytes_sync(filename, payload)
         
         if result:
-            self._last_save_time[strategy_id] = current_time
-            logger.debug(f"保存网格状态: {strategy_id}")
+            self._last_save_time[strategy_id] = now
+            self._last_state_hash[strategy_id] = state_hash
+            self._known_strategies.add(strategy_id)
+            logger.debug("保存网格状态: %s", strategy_id)
             
         return result
     
@@ -98,6 +128,8 @@ class GridStateManager:
         
         if strategy_id in self._last_save_time:
             del self._last_save_time[strategy_id]
+        self._last_state_hash.pop(strategy_id, None)
+        self._known_strategies.discard(strategy_id)
             
         result = self.storage.delete_file(filename)
         
@@ -131,9 +163,7 @@ class GridStateManager:
         Returns:
             策略ID列表
         """
-        files = self.storage.list_files("*.json")
-        strategy_ids = [f.replace(".json", "") for f in files]
-        return strategy_ids
+        return list(self._known_strategies)
     
     def get_all_grid_states(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -143,14 +173,19 @@ class GridStateManager:
             策略ID -> 状态数据的字典
         """
         strategy_ids = self.list_grid_states()
-        states = {}
-        
-        for strategy_id in strategy_ids:
-            state = self.load_grid_state(strategy_id)
-            if state:
-                states[strategy_id] = state
-                
-        return states
+        if not strategy_ids:
+            return {}
+            
+        # 并行读取所有状态文件
+        filenames = [f"{strategy_id}.json" for strategy_id in strategy_ids]
+        with ThreadPoolExecutor(max_workers=min(8, len(filenames))) as executor:
+            results = list(executor.map(self.storage.load_json_sync, filenames))
+            
+        return {
+            strategy_id: state
+            for strategy_id, state in zip(strategy_ids, results)
+            if state
+        }
     
     def save_system_status(self, status: Dict[str, Any]) -> bool:
         """
@@ -173,6 +208,16 @@ class GridStateManager:
         """
         return self.storage.load_json_sync("system_status.json")
     
+    def _backup_system_status(self):
+        """
+        将系统状态文件复制为备份，先写临时文件再替换，避免中途失败留下不完整的备份
+        """
+        backup_path = self.storage.get_file_path("system_status.backup.json")
+        temp_path = f"{backup_path}.tmp"
+        
+        shutil.copyfile(self.storage.get_file_path("system_status.json"), temp_path)
+        os.replace(temp_path, backup_path)
+    
     async def auto_backup_states(self, interval: int = 3600):
         """
         定期自动备份所有网格状态
@@ -180,18 +225,24 @@ class GridStateManager:
         Args:
             interval: 备份间隔(秒)
         """
+        loop = asyncio.get_running_loop()
+        
         while True:
             try:
                 # 获取所有策略ID
                 strategy_ids = self.list_grid_states()
                 
-                for strategy_id in strategy_ids:
-                    self.backup_grid_state(strategy_id)
+                # 在线程池中并行备份各策略状态
+                await asyncio.gather(*(
+                    loop.run_in_executor(None, self.backup_grid_state, strategy_id)
+                    for strategy_id in strategy_ids
+                ))
                     
-                # 备份系统状态
-                system_status = self.load_system_status()
-                if system_status:
-                    self.storage.save_json_sync("system_status.backup.json", system_status)
+                # 备份系统状态(直接复制文件，无需解析后重新序列化)
+                try:
+                    await loop.run_in_executor(None, self._backup_system_status)
+                except FileNotFoundError:
+                    pass
                     
                 logger.info(f"自动备份完成，备份了 {len(strategy_ids)} 个网格状态")
                     
@@ -2,11 +2,16 @@
 交易记录器 - 记录和管理交易数据
 """
 import os
+import sys
+import glob
 import time
-import json
+import heapq
 from decimal import Decimal
-from typing import Dict, Any, List, Optional
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple, Iterator
 import asyncio
+from collections import defaultdict
 
 from girdbot.storage.file_storage import FileStorage
 from girdbot.utils.logger import get_logger
@@ -16,6 +21,9 @@ logger = get_logger("trade_recorder")
 class Trade:
     """交易记录类"""
     
+    __slots__ = ('trade_id', 'strategy_id', 'order_id', 'trading_pair', 'side',
+                 'price', 'amount', 'timestamp', 'fee', 'fee_currency')
+    
     def __init__(self, 
                  trade_id: str,
                  strategy_id: str,
@@ -103,11 +111,27 @@ class TradeRecorder:
         self.storage = FileStorage(os.path.join(data_dir, "trades"))
         self.trades_cache: Dict[str, List[Dict[str, Any]]] = {}  # 策略ID -> 交易记录列表
         self._cache_initialized: Dict[str, bool] = {}  # 策略ID -> 缓存是否已初始化
+        self._by_trade_id: Dict[str, Dict[str, Any]] = {}  # 交易ID -> 交易记录
+        self._by_order_id: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # 订单ID -> 交易记录列表
+        self._all_strategies_loaded = False  # 是否已加载磁盘上所有策略的交易记录
+        self._known_strategies = set(self._scan_dir())  # 有交易记录的策略ID
+        self._totals: Dict[str, Dict[str, Decimal]] = {}  # 策略ID -> 累计成交量/成交额/手续费
         self._lock = asyncio.Lock()  # 用于保护缓存访问的锁
+        
+        # 待写入日志的交易记录，由后台任务批量写入
+        self._pending: Dict[str, List[bytes]] = defaultdict(list)  # 策略ID -> 待写入的JSON行
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_interval = 0.05  # 批量写入的合并窗口(秒)
+        self._log_lines: Dict[str, int] = defaultdict(int)  # 策略ID -> 日志中未压缩的记录数
+        self._log_gen: Dict[str, int] = {}  # 策略ID -> 当前写入的日志代号
+        self._compacting: set = set()  # 正在压缩的策略ID
+        self._compact_tasks: set = set()  # 后台压缩任务，保持引用直到完成
+        self._compact_threshold = 10000  # 日志记录数达到该值时自动压缩为快照
     
     def _get_trades_file(self, strategy_id: str) -> str:
         """
-        获取策略交易记录文件名
+        获取策略交易记录快照文件名
         
         Args:
             strategy_id: 策略ID
@@ -117,6 +141,59 @@ class TradeRecorder:
         """
         return f"{strategy_id}_trades.json"
     
+    def _get_trades_log_file(self, strategy_id: str, generation: int = 0) -> str:
+        """
+        获取策略交易记录追加日志文件名
+        
+        每次压缩都会切换到新一代日志，快照记录自己已包含到哪一代，
+        因此压缩过程中任何一步中断都不会导致记录重复或丢失
+        
+        Args:
+            strategy_id: 策略ID
+            generation: 日志代号，0为最初的日志文件
+            
+        Returns:
+            文件名
+        """
+        if generation == 0:
+            return f"{strategy_id}_trades.log"
+        return f"{strategy_id}_trades.log.{generation}"
+    
+    @staticmethod
+    def _parse_log_generation(suffix: str) -> Optional[int]:
+        """
+        解析日志文件名中 "_trades.log" 之后的部分
+        
+        Args:
+            suffix: 文件名后缀
+            
+        Returns:
+            日志代号，不是日志文件时返回None
+        """
+        if not suffix:
+            return 0
+        if suffix[0] == '.' and suffix[1:].isdigit():
+            return int(suffix[1:])
+        return None
+    
+    def _list_log_generations(self, strategy_id: str) -> List[int]:
+        """
+        列出磁盘上策略的所有日志代号
+        
+        Args:
+            strategy_id: 策略ID
+            
+        Returns:
+            从小到大排列的日志代号列表
+        """
+        prefix = f"{strategy_id}_trades.log"
+        generations = []
+        for filename in self.storage.list_files(glob.escape(prefix) + "*"):
+            generation = self._parse_log_generation(filename[len(prefix):])
+            if generation is not None:
+                generations.append(generation)
+        return sorted(generations)
+    
     async def _ensure_cache_initialized(self, strategy_id: str):
         """
         确保缓存已初始化
@@ -134,12 +211,132 @@ class TradeRecorder:
             filename = self._get_trades_file(strategy_id)
             trades_data = await self.storage.load_json(filename)
             
-            if trades_data:
-                self.trades_cache[strategy_id] = trades_data
-            else:
-                self.trades_cache[strategy_id] = []
+            # record_trade可能在等待读取期间同步加载了缓存并追加了新记录，不能覆盖
+            if self._cache_initialized.get(strategy_id):
+                return
                 
-            self._cache_initialized[strategy_id] = True
+            self._set_cache(strategy_id, self._replay_log(strategy_id, trades_data))
+    
+    def _load_trades_sync(self, strategy_id: str):
+        """
+        同步加载策略的交易记录到缓存
+        
+        Args:
+            strategy_id: 策略ID
+        """
+        filename = self._get_trades_file(strategy_id)
+        trades_data = self.storage.load_json_sync(filename)
+        
+        self._set_cache(strategy_id, self._replay_log(strategy_id, trades_data))
+    
+    def _set_cache(self, strategy_id: str, trades: List[Dict[str, Any]]):
+        """
+        设置策略的交易记录缓存并建立索引
+        
+        Args:
+            strategy_id: 策略ID
+            trades: 交易记录列表
+        """
+        self.trades_cache[strategy_id] = trades
+        self._cache_initialized[strategy_id] = True
+        self._totals[strategy_id] = self._new_totals()
+        for trade in trades:
+            # 驻留重复度高的字符串，所有记录共享同一对象
+            trade["trading_pair"] = sys.intern(trade["trading_pair"])
+            trade["side"] = sys.intern(trade["side"])
+            self._index_trade(trade)
+            self._accumulate(strategy_id, trade)
+    
+    def _index_trade(self, trade: Dict[str, Any]):
+        """
+        将交易记录加入交易ID和订单ID索引
+        
+        Args:
+            trade: 交易记录
+        """
+        # 交易ID重复时保留最早的记录
+        self._by_trade_id.setdefault(trade["trade_id"], trade)
+        self._by_order_id[trade["order_id"]].append(trade)
+    
+    @staticmethod
+    def _new_totals() -> Dict[str, Decimal]:
+        """
+        创建空的累计统计
+        
+        Returns:
+            累计统计字典
+        """
+        return {
+            "buy_volume": Decimal("0"),
+            "sell_volume": Decimal("0"),
+            "buy_value": Decimal("0"),
+            "sell_value": Decimal("0"),
+            "fees": Decimal("0")
+        }
+    
+    def _accumulate(self, strategy_id: str, trade: Dict[str, Any]):
+        """
+        将一笔交易计入策略的累计统计
+        
+        Args:
+            strategy_id: 策略ID
+            trade: 交易记录
+        """
+        totals = self._totals[strategy_id]
+        price = Decimal(trade["price"])
+        amount = Decimal(trade["amount"])
+        
+        if trade["side"] == "buy":
+            totals["buy_volume"] += amount
+            totals["buy_value"] += price * amount
+        else:  # sell
+            totals["sell_volume"] += amount
+            totals["sell_value"] += price * amount
+            
+        if trade.get("fee") is not None:
+            totals["fees"] += Decimal(trade["fee"])
+    
+    def _rebuild_indexes(self):
+        """
+        根据所有缓存的交易记录重建索引
+        """
+        self._by_trade_id = {}
+        self._by_order_id = defaultdict(list)
+        for trades in self.trades_cache.values():
+            for trade in trades:
+                self._index_trade(trade)
+    
+    def _replay_log(self, strategy_id: str, trades_data: Any) -> List[Dict[str, Any]]:
+        """
+        在快照基础上重放追加日志，得到完整的交易记录
+        
+        Args:
+            strategy_id: 策略ID
+            trades_data: 快照内容(可能为None)，旧版本的快照是交易记录列表
+            
+        Returns:
+            交易记录列表
+        """
+        if isinstance(trades_data, dict):
+            snapshot_gen = trades_data.get("log_generation", 0)
+            trades = trades_data.get("trades", [])
+        else:
+            snapshot_gen = 0
+            trades = trades_data or []
+            
+        generations = self._list_log_generations(strategy_id)
+        log_lines = 0
+        for generation in generations:
+            # 快照已包含更早代号的日志，这些是压缩后未删除成功的残留文件
+            if generation < snapshot_gen:
+                continue
+            log_records = self.storage.load_json_lines(self._get_trades_log_file(strategy_id, generation))
+            log_lines += len(log_records)
+            trades.extend(log_records)
+            
+        self._log_gen[strategy_id] = max([snapshot_gen] + generations)
+        self._log_lines[strategy_id] = log_lines
+        return trades
     
     def record_trade(self, strategy_id: str, order_id: str, trading_pair: str, 
                     side: str, price: Decimal, amount: Decimal, timestamp: float,
@@ -164,50 +361,217 @@ class TradeRecorder:
         # 生成交易ID
         trade_id = f"{strategy_id}_{int(timestamp)}_{order_id[-8:]}"
         
-        # 创建交易记录
-        trade = Trade(
-            trade_id=trade_id,
-            strategy_id=strategy_id,
-            order_id=order_id,
-            trading_pair=trading_pair,
-            side=side,
-            price=price,
-            amount=amount,
-            timestamp=timestamp,
-            fee=fee,
-            fee_currency=fee_currency
-        )
+        # 直接构建交易记录字典，格式与 Trade.to_dict() 一致
+        trade_dict = {
+            "trade_id": trade_id,
+            "strategy_id": strategy_id,
+            "order_id": order_id,
+            "trading_pair": sys.intern(trading_pair),
+            "side": sys.intern(side),
+            "price": str(price),
+            "amount": str(amount),
+            "timestamp": timestamp,
+            "fee": str(fee) if fee else None,
+            "fee_currency": fee_currency
+        }
         
-        # 确保缓存已初始化
-        if strategy_id not in self.trades_cache:
-            self.trades_cache[strategy_id] = []
-            self._cache_initialized[strategy_id] = True
+        # 确保缓存已初始化，避免之后压缩时丢失历史记录
+        if not self._cache_initialized.get(strategy_id):
+            self._load_trades_sync(strategy_id)
             
         # 添加到缓存
-        self.trades_cache[strategy_id].append(trade.to_dict())
+        self._known_strategies.add(strategy_id)
+        self.trades_cache[strategy_id].append(trade_dict)
+        self._index_trade(trade_dict)
+        self._accumulate(strategy_id, trade_dict)
         
-        # 保存到文件
-        self._save_trades(strategy_id)
+        # 交给后台任务追加到日志文件，快照只在压缩时重写
+        self._pending[strategy_id].append(self.storage.dumps(trade_dict))
+        self._schedule_flush()
         
-        logger.debug(f"记录交易: {trade_id}, {side} {amount} {trading_pair} @ {price}")
+        logger.debug("记录交易: %s, %s %s %s @ %s", trade_id, side, amount, trading_pair, price)
         
         return trade_id
     
-    def _save_trades(self, strategy_id: str) -> bool:
+    def _schedule_flush(self):
+        """
+        通知后台任务写入待处理的交易记录，没有运行中的事件循环时直接写入
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_pending()
+            return
+            
+        if self._flusher is None or self._flusher.done():
+            self._flush_event = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flusher_task())
+            
+        self._flush_event.set()
+    
+    async def _flusher_task(self):
         """
-        保存策略的交易记录
+        后台写入任务，合并一个时间窗口内的交易记录后每个策略只写一次
+        """
+        while True:
+            await self._flush_event.wait()
+            # 等待一小段时间，让突发的成交合并为一次写入
+            await asyncio.sleep(self._flush_interval)
+            self._flush_event.clear()
+            
+            try:
+                self._write_pending()
+            except Exception as e:
+                logger.error(f"批量写入交易记录失败: {e}")
+    
+    def _write_pending(self):
+        """
+        将所有待处理的交易记录追加到各策略的日志文件
+        """
+        pending, self._pending = self._pending, defaultdict(list)
+        
+        for strategy_id, lines in pending.items():
+            log_file = self._get_trades_log_file(strategy_id, self._log_gen.get(strategy_id, 0))
+            if not self.storage.append_lines(log_file, lines):
+                # 写入失败时放回队列，等待下次重试
+                self._pending[strategy_id][:0] = lines
+                continue
+                
+            # 日志过长时压缩为快照，限制启动时的重放量
+            self._log_lines[strategy_id] += len(lines)
+            if self._log_lines[strategy_id] >= self._compact_threshold and strategy_id not in self._compacting:
+                self._schedule_compact(strategy_id)
+    
+    def _schedule_compact(self, strategy_id: str):
+        """
+        在后台压缩策略日志，没有运行中的事件循环时直接压缩
+        
+        Args:
+            strategy_id: 策略ID
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.compact(strategy_id)
+            return
+            
+        task = asyncio.create_task(self.compact_async(strategy_id))
+        self._compact_tasks.add(task)
+        task.add_done_callback(self._compact_tasks.discard)
+    
+    async def flush(self):
+        """
+        立即写入所有待处理的交易记录
+        """
+        self._write_pending()
+    
+    async def close(self):
+        """
+        停止后台写入任务并写入剩余的交易记录，在系统关闭时调用
+        """
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self._flusher = None
+        
+        await self.flush()
+        
+        if self._compact_tasks:
+            await asyncio.gather(*self._compact_tasks, return_exceptions=True)
+    
+    def _begin_compact(self, strategy_id: str) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        开始压缩：先把待写入的记录追加到当前日志，再切换到新一代日志
+        
+        切换之后的新记录只会写入新日志，快照只需包含切换时缓存中的记录
         
         Args:
             strategy_id: 策略ID
             
         Returns:
-            是否成功保存
+            (新的日志代号, 快照中的交易记录)，无法压缩时返回None
         """
-        if strategy_id not in self.trades_cache:
+        if strategy_id not in self.trades_cache or strategy_id in self._compacting:
+            return None
+            
+        generation = self._log_gen.get(strategy_id, 0)
+        lines = self._pending.pop(strategy_id, None)
+        if lines and not self.storage.append_lines(self._get_trades_log_file(strategy_id, generation), lines):
+            self._pending[strategy_id][:0] = lines
+            return None
+            
+        self._log_gen[strategy_id] = generation + 1
+        self._log_lines[strategy_id] = 0
+        self._compacting.add(strategy_id)
+        return generation + 1, list(self.trades_cache[strategy_id])
+    
+    def _write_snapshot(self, strategy_id: str, generation: int, trades: List[Dict[str, Any]]) -> bool:
+        """
+        写入快照并删除快照已包含的旧日志，不访问缓存，可在线程池中执行
+        
+        Args:
+            strategy_id: 策略ID
+            generation: 快照之后的第一个日志代号
+            trades: 快照中的交易记录
+            
+        Returns:
+            是否成功写入快照
+        """
+        snapshot = {"log_generation": generation, "trades": trades}
+        if not self.storage.save_json_sync(self._get_trades_file(strategy_id), snapshot):
+            # 快照未更新，旧日志仍然有效，加载时会继续重放
             return False
             
-        filename = self._get_trades_file(strategy_id)
-        return self.storage.save_json_sync(filename, self.trades_cache[strategy_id])
+        # 删除失败的日志在加载时会按快照的代号跳过，下次压缩时再删除
+        for old_gen in self._list_log_generations(strategy_id):
+            if old_gen < generation:
+                self.storage.delete_file(self._get_trades_log_file(strategy_id, old_gen))
+        return True
+    
+    def compact(self, strategy_id: str) -> bool:
+        """
+        将缓存中的交易记录重写为快照，并清理已包含在快照中的追加日志
+        
+        Args:
+            strategy_id: 策略ID
+            
+        Returns:
+            是否成功压缩
+        """
+        started = self._begin_compact(strategy_id)
+        if started is None:
+            return False
+            
+        try:
+            return self._write_snapshot(strategy_id, *started)
+        finally:
+            self._compacting.discard(strategy_id)
+    
+    async def compact_async(self, strategy_id: str) -> bool:
+        """
+        异步压缩，快照在线程池中写入，不阻塞事件循环
+        
+        Args:
+            strategy_id: 策略ID
+            
+        Returns:
+            是否成功压缩
+        """
+        started = self._begin_compact(strategy_id)
+        if started is None:
+            return False
+            
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self._write_snapshot, strategy_id, *started)
+        except Exception as e:
+            logger.error(f"压缩交易记录失败: {strategy_id}, {e}")
+            return False
+        finally:
+            self._compacting.discard(strategy_id)
     
     async def get_trades_by_strategy(self, strategy_id: str) -> List[Dict[str, Any]]:
         """
@@ -222,6 +586,40 @@ class TradeRecorder:
         await self._ensure_cache_initialized(strategy_id)
         return self.trades_cache.get(strategy_id, [])
     
+    async def iter_recent_trades(self, strategy_id: Optional[str] = None, 
+                                 limit: int = 20) -> Iterator[Dict[str, Any]]:
+        """
+        按时间从新到旧逐条返回最近的交易记录
+        
+        返回前已加载好所需的缓存，加载失败会在调用时抛出，迭代过程中不再读取文件
+        
+        Args:
+            strategy_id: 策略ID，为None时返回所有策略的记录
+            limit: 最多返回的记录数
+            
+        Returns:
+            交易记录的迭代器
+        """
+        if limit <= 0:
+            return iter(())
+            
+        if strategy_id:
+            # 未知的策略ID直接返回，避免按请求参数无限制地创建缓存项
+            if strategy_id not in self._known_strategies:
+                return iter(())
+            await self._ensure_cache_initialized(strategy_id)
+            return islice(reversed(self.trades_cache.get(strategy_id, [])), limit)
+            
+        strategy_ids = self.list_strategies()
+        for sid in strategy_ids:
+            await self._ensure_cache_initialized(sid)
+            
+        # 每个策略的记录按追加顺序存放，只需取各自末尾的limit条参与排序
+        candidates = chain.from_iterable(
+            self.trades_cache.get(sid, [])[-limit:] for sid in strategy_ids
+        )
+        return iter(heapq.nlargest(limit, candidates, key=itemgetter("timestamp")))
+    
     async def get_trades_by_order(self, order_id: str) -> List[Dict[str, Any]]:
         """
         获取订单的所有交易记录
@@ -232,18 +630,13 @@ class TradeRecorder:
         Returns:
             交易记录列表
         """
-        result = []
+        # 首次查询时加载磁盘上所有策略的交易记录，之后的新记录会直接进入索引
+        if not self._all_strategies_loaded:
+            for strategy_id in self.list_strategies():
+                await self._ensure_cache_initialized(strategy_id)
+            self._all_strategies_loaded = True
         
-        # 遍历所有策略的交易记录
-        for strategy_id in self.list_strategies():
-            await self._ensure_cache_initialized(strategy_id)
-            
-            if strategy_id in self.trades_cache:
-                for trade in self.trades_cache[strategy_id]:
-                    if trade["order_id"] == order_id:
-                        result.append(trade)
-        
-        return result
+        return list(self._by_order_id.get(order_id, ()))
     
     async def get_trade_by_id(self, trade_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -255,21 +648,30 @@ class TradeRecorder:
         Returns:
             交易记录或None
         """
-        # 提取策略ID
-        parts = trade_id.split('_')
-        if len(parts) < 2:
+        # 提取策略ID，交易ID格式为 {策略ID}_{时间戳}_{订单ID后8位}
+        parts = trade_id.rsplit('_', 2)
+        if len(parts) < 3:
             return None
             
         strategy_id = parts[0]
         
         await self._ensure_cache_initialized(strategy_id)
         
-        if strategy_id in self.trades_cache:
-            for trade in self.trades_cache[strategy_id]:
-                if trade["trade_id"] == trade_id:
-                    return trade
+        return self._by_trade_id.get(trade_id)
+    
+    def _scan_dir(self) -> List[str]:
+        """
+        扫描存储目录中的交易记录文件
         
-        return None
+        Returns:
+            策略ID列表
+        """
+        strategy_ids = {f[:-len("_trades.json")] for f in self.storage.list_files("*_trades.json")}
+        for filename in self.storage.list_files("*_trades.log*"):
+            strategy_id, _, suffix = filename.rpartition("_trades.log")
+            if self._parse_log_generation(suffix) is not None:
+                strategy_ids.add(strategy_id)
+        return list(strategy_ids)
     
     def list_strategies(self) -> List[str]:
         """
@@ -278,8 +680,7 @@ class TradeRecorder:
         Returns:
             策略ID列表
         """
-        files = self.storage.list_files("*_trades.json")
-        return [f.replace("_trades.json", "") for f in files]
+        return list(self._known_strategies)
     
     async def calculate_profit(self, strategy_id: str) -> Dict[str, Any]:
         """
@@ -304,26 +705,13 @@ class TradeRecorder:
                 "total_fees": 0
             }
         
-        total_buy_volume = Decimal("0")
-        total_sell_volume = Decimal("0")
-        total_buy_value = Decimal("0")
-        total_sell_value = Decimal("0")
-        total_fees = Decimal("0")
-        
-        for trade in trades:
-            price = Decimal(trade["price"])
-            amount = Decimal(trade["amount"])
-            value = price * amount
-            
-            if trade["side"] == "buy":
-                total_buy_volume += amount
-                total_buy_value += value
-            else:  # sell
-                total_sell_volume += amount
-                total_sell_value += value
-                
-            if trade.get("fee") is not None:
-                total_fees += Decimal(trade["fee"])
+        # 累计统计在加载缓存和记录交易时增量维护，这里无需遍历交易记录
+        totals = self._totals[strategy_id]
+        total_buy_volume = totals["buy_volume"]
+        total_sell_volume = totals["sell_volume"]
+        total_buy_value = totals["buy_value"]
+        total_sell_value = totals["sell_value"]
+        total_fees = totals["fees"]
         
         # 计算已实现盈亏
         if total_buy_volume > 0 and total_sell_volume > 0:
@@ -362,38 +750,42 @@ class TradeRecorder:
         
         try:
             import csv
-            import datetime
             
-            with open(filepath, 'w', newline='') as csvfile:
-                fieldnames = ['trade_id', 'timestamp', 'datetime', 'order_id', 
-                              'trading_pair', 'side', 'price', 'amount', 
-                              'value', 'fee', 'fee_currency']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            def rows():
+                # 同一秒内的成交共用格式化后的时间字符串
+                last_second = None
+                datetime_str = ""
                 
-                writer.writeheader()
                 for trade in trades:
-                    # 计算交易价值
-                    price = Decimal(trade["price"])
-                    amount = Decimal(trade["amount"])
-                    value = price * amount
-                    
-                    # 转换时间戳为可读格式
-                    dt = datetime.datetime.fromtimestamp(trade["timestamp"])
-                    datetime_str = dt.strftime('%Y-%m-%d %H:%M:%S')
+                    timestamp = trade["timestamp"]
+                    second = int(timestamp)
+                    if second != last_second:
+                        datetime_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+                        last_second = second
+                        
+                    # 交易价值仅用于展示，使用浮点运算
+                    value = float(trade["price"]) * float(trade["amount"])
                     
-                    writer.writerow({
-                        'trade_id': trade["trade_id"],
-                        'timestamp': trade["timestamp"],
-                        'datetime': datetime_str,
-                        'order_id': trade["order_id"],
-                        'trading_pair': trade["trading_pair"],
-                        'side': trade["side"],
-                        'price': trade["price"],
-                        'amount': trade["amount"],
-                        'value': str(value),
-                        'fee': trade.get("fee", ""),
-                        'fee_currency': trade.get("fee_currency", "")
-                    })
+                    yield (
+                        trade["trade_id"],
+                        timestamp,
+                        datetime_str,
+                        trade["order_id"],
+                        trade["trading_pair"],
+                        trade["side"],
+                        trade["price"],
+                        trade["amount"],
+                        f"{value:.10f}",
+                        trade.get("fee", ""),
+                        trade.get("fee_currency", "")
+                    )
+            
+            with open(filepath, 'w', newline='', buffering=1 << 20) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(('trade_id', 'timestamp', 'datetime', 'order_id',
+                                 'trading_pair', 'side', 'price', 'amount',
+                                 'value', 'fee', 'fee_currency'))
+                writer.writerows(rows())
             
             logger.info(f"已导出策略 {strategy_id} 的交易记录到 {filepath}")
             return True
@@ -430,9 +822,14 @@ class TradeRecorder:
             trade for trade in self.trades_cache[strategy_id]
             if trade["timestamp"] >= cutoff_time
         ]
+        self._rebuild_indexes()
+        
+        self._totals[strategy_id] = self._new_totals()
+        for trade in self.trades_cache[strategy_id]:
+            self._accumulate(strategy_id, trade)
         
         # 保存更新后的交易记录
-        self._save_trades(strategy_id)
+        await self.compact_async(strategy_id)
         
         removed_count = original_count - len(self.trades_cache[strategy_id])
         logger.info(f"已清理策略 {strategy_id} 的 {removed_count} 条旧交易记录")
@@ -4,12 +4,31 @@
 import os
 import re
 import yaml
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
 from girdbot.utils.logger import get_logger
 
+# 优先使用libyaml提供的C解析器，未安装时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = get_logger("config_loader")
 
+# 环境变量引用，格式如 ${ENV_VAR} 或 ${ENV_VAR:default_value}
+_ENV_VAR_RE = re.compile(r'\${([A-Za-z0-9_]+)(?::([^}]*))?}')
+
+# 模式类型 -> (对应的Python类型, 错误提示中的类型名)
+_TYPE_MAP = {
+    "string": (str, "字符串"),
+    "number": ((int, float), "数字"),
+    "boolean": (bool, "布尔"),
+    "array": (list, "数组"),
+    "object": (dict, "对象"),
+}
+
 def load_config(config_path: str) -> Optional[Dict[str, Any]]:
     """
     加载配置文件
@@ -25,9 +44,9 @@ def load_config(config_path: str) -> Optional[Dict[str, Any]]:
             logger.error(f"配置文件不存在: {config_path}")
             return None
             
-        with open(config_path, 'r', encoding='utf-8') as file:
-            # 加载YAML配置
-            config = yaml.safe_load(file)
+        with open(config_path, 'rb') as file:
+            # 加载YAML配置(以字节读取，由解析器自行解码)
+            config = yaml.load(file, Loader=_YamlLoader)
             
             # 处理环境变量
             config = _process_env_vars(config)
@@ -52,23 +71,59 @@ def _process_env_vars(config: Any) -> Any:
     Returns:
         处理后的配置
     """
-    if isinstance(config, dict):
-        return {k: _process_env_vars(v) for k, v in config.items()}
-    elif isinstance(config, list):
-        return [_process_env_vars(item) for item in config]
-    elif isinstance(config, str):
-        # 处理环境变量引用，格式如 ${ENV_VAR} 或 ${ENV_VAR:default_value}
-        pattern = r'\${([A-Za-z0-9_]+)(?::([^}]*))?}'
-        
-        def replace_env_var(match):
-            env_var = match.group(1)
-            default_value = match.group(2) if match.group(2) is not None else ""
-            
-            return os.environ.get(env_var, default_value)
-            
-        return re.sub(pattern, replace_env_var, config)
-    else:
+    if isinstance(config, str):
+        return _resolve_env_str(config)
+    if not isinstance(config, (dict, list)):
         return config
+        
+    # 使用显式栈遍历嵌套结构，避免深层配置的递归开销
+    root = config.copy()
+    stack = [root]
+    
+    while stack:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        
+        for key, value in items:
+            if isinstance(value, str):
+                node[key] = _resolve_env_str(value)
+            elif isinstance(value, (dict, list)):
+                child = value.copy()
+                node[key] = child
+                stack.append(child)
+                
+    return root
+
+def _resolve_env_str(value: str) -> str:
+    """
+    替换字符串中的环境变量引用
+    
+    Args:
+        value: 字符串配置值
+        
+    Returns:
+        替换后的字符串
+    """
+    # 大多数配置值不引用环境变量，跳过正则匹配
+    if '$' not in value:
+        return value
+        
+    return _ENV_VAR_RE.sub(_replace_env_var, value)
+
+def _replace_env_var(match) -> str:
+    """
+    替换单个环境变量引用
+    
+    Args:
+        match: 正则匹配结果
+        
+    Returns:
+        环境变量的值或默认值
+    """
+    env_var = match.group(1)
+    default_value = match.group(2) if match.group(2) is not None else ""
+    
+    return os.environ.get(env_var, default_value)
 
 def validate_config(config: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     """
@@ -81,35 +136,22 @@ def validate_config(config: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     Returns:
         配置是否有效
     """
-    # 简单的配置验证逻辑
+    # 一次性检查所有必需项
+    required_keys = frozenset(k for k, v in schema.items() if v.get("required", False))
+    if not required_keys.issubset(config):
+        missing = sorted(required_keys.difference(config))
+        logger.error(f"缺少必需的配置项: {', '.join(missing)}")
+        return False
+        
+    # 对配置中存在的项检查类型
     for key, schema_value in schema.items():
-        # 检查必需项
-        if schema_value.get("required", False) and key not in config:
-            logger.error(f"缺少必需的配置项: {key}")
-            return False
+        if key not in config:
+            continue
             
-        # 如果配置中存在此项，则检查类型
-        if key in config:
-            value = config[key]
-            expected_type = schema_value.get("type")
-            
-            if expected_type:
-                # 处理类型检查
-                if expected_type == "string" and not isinstance(value, str):
-                    logger.error(f"配置项 {key} 应为字符串类型")
-                    return False
-                elif expected_type == "number" and not isinstance(value, (int, float)):
-                    logger.error(f"配置项 {key} 应为数字类型")
-                    return False
-                elif expected_type == "boolean" and not isinstance(value, bool):
-                    logger.error(f"配置项 {key} 应为布尔类型")
-                    return False
-                elif expected_type == "array" and not isinstance(value, list):
-                    logger.error(f"配置项 {key} 应为数组类型")
-                    return False
-                elif expected_type == "object" and not isinstance(value, dict):
-                    logger.error(f"配置项 {key} 应为对象类型")
-                    return False
+        expected = _TYPE_MAP.get(schema_value.get("type"))
+        if expected and not isinstance(config[key], expected[0]):
+            logger.error(f"配置项 {key} 应为{expected[1]}类型")
+            return False
     
     return True
 
@@ -126,15 +168,22 @@ def merge_configs(base_config: Dict[str, Any], override_config: Dict[str, Any])
     """
     merged_config = base_config.copy()
     
-    for key, value in override_config.items():
-        # 如果两个配置都有该项，且都是字典，则递归合并
-        if (key in merged_config and 
-            isinstance(merged_config[key], dict) and 
-            isinstance(value, dict)):
-            merged_config[key] = merge_configs(merged_config[key], value)
-        else:
-            # 否则直接覆盖
-            merged_config[key] = value
+    # 使用(目标, 覆盖)对的显式栈同步遍历两棵配置树
+    stack = [(merged_config, override_config)]
+    
+    while stack:
+        dst, src = stack.pop()
+        
+        for key, value in src.items():
+            current = dst.get(key)
+            # 如果两个配置都有该项，且都是字典，则继续合并下一层
+            if isinstance(current, dict) and isinstance(value, dict):
+                child = current.copy()
+                dst[key] = child
+                stack.append((child, value))
+            else:
+                # 否则直接覆盖
+                dst[key] = value
     
     return merged_config
 
@@ -174,31 +223,49 @@ def get_config_value(config: Dict[str, Any], path: str, default: Any = None) ->
     if not config:
         return default
         
-    parts = path.split(".")
+    steps = _parse_path(path)
+    if steps is None:
+        return default
+        
     current = config
     
-    for part in parts:
+    for key, index in steps:
+        if not isinstance(current, dict) or key not in current:
+            return default
+            
+        current = current[key]
+        
         # 处理数组索引，如 exchanges[0]
+        if index is not None:
+            if not isinstance(current, list) or index < 0 or index >= len(current):
+                return default
+                
+            current = current[index]
+    
+    return current
+
+@lru_cache(maxsize=1024)
+def _parse_path(path: str) -> Optional[Tuple[Tuple[str, Optional[int]], ...]]:
+    """
+    将配置路径解析为(键, 数组索引)步骤序列，结果会被缓存
+    
+    Args:
+        path: 配置路径，格式如 "system.log_level" 或 "exchanges[0].api_key"
+        
+    Returns:
+        步骤元组，路径中的数组索引无效时返回None
+    """
+    steps = []
+    
+    for part in path.split("."):
         if "[" in part and part.endswith("]"):
-            array_name = part[:part.index("[")]
-            index_str = part[part.index("[")+1:part.index("]")]
-            
+            key, _, rest = part.partition("[")
             try:
-                index = int(index_str)
-                if array_name not in current or not isinstance(current[array_name], list):
-                    return default
-                    
-                if index < 0 or index >= len(current[array_name]):
-                    return default
-                    
-                current = current[array_name][index]
+                index = int(rest[:rest.index("]")])
             except ValueError:
-                return default
+                return None
+            steps.append((key, index))
         else:
-            # 普通属性
-            if part not in current:
-                return default
-                
-            current = current[part]
-    
-    return current
\ No newline at end of file
+            steps.append((part, None))
+            
+    return tuple(steps)
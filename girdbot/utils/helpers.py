@@ -1,11 +1,62 @@
 """
 辅助函数 - 提供通用工具函数
 """
+import os
 import time
+import random
+import asyncio
 import datetime
-from decimal import Decimal, ROUND_DOWN, ROUND_UP
+import functools
+from decimal import Decimal, InvalidOperation, ROUND_DOWN, ROUND_UP
+from functools import lru_cache
 from typing import Union, Dict, Optional, Tuple
 
+# 常用的Decimal常量
+_ONE = Decimal('1')
+_ZERO = Decimal('0')
+
+# 预先生成的精度值，_PRECISIONS[n] == Decimal('1E-n')
+_PRECISIONS = tuple(_ONE.scaleb(-i) for i in range(19))
+
+def _precision_from_digits(digits: int) -> Decimal:
+    """
+    将小数位数转换为精度值
+    """
+    if 0 <= digits < len(_PRECISIONS):
+        return _PRECISIONS[digits]
+    return _ONE.scaleb(-digits)
+
+# 时间周期单位 -> 秒数：分钟、小时、天、周
+_TIMEFRAME_UNITS = {'m': 60, 'h': 60 * 60, 'd': 60 * 60 * 24, 'w': 60 * 60 * 24 * 7}
+
+# 常用时间周期的秒数，如 '5m' -> 300
+_TIMEFRAME_TABLE = {
+    f"{n}{unit}": n * multiplier
+    for unit, multiplier in _TIMEFRAME_UNITS.items()
+    for n in (1, 2, 3, 4, 5, 6, 8, 12, 15, 30)
+}
+
+# safe_decimal按值的类型选择转换函数，float先转字符串以避免二进制误差
+_DECIMAL_CONVERTERS = {
+    Decimal: lambda v: v,
+    int: Decimal,
+    float: lambda v: Decimal(str(v)),
+    str: Decimal,
+}
+
+@lru_cache(maxsize=64)
+def _decimal_quantum(precision: Decimal) -> Optional[Decimal]:
+    """
+    精度为1或10的负整数次幂时返回可直接用于quantize的量子，否则返回None
+    
+    10及以上的精度quantize后会得到科学计数法形式(如1.2E+2)，仍走原有的计算方式
+    """
+    quantum = precision.normalize()
+    sign, digits, exponent = quantum.as_tuple()
+    if sign or digits != (1,) or exponent > 0:
+        return None
+    return quantum
+
 def round_to_precision(value: Decimal, precision: Decimal, rounding=ROUND_DOWN) -> Decimal:
     """
     将数值舍入到指定精度
@@ -18,12 +69,17 @@ def round_to_precision(value: Decimal, precision: Decimal, rounding=ROUND_DOWN)
     Returns:
         舍入后的值
     """
-    if precision == 0:
+    if precision == _ZERO:
         return value
         
-    return (value / precision).quantize(Decimal('1'), rounding=rounding) * precision
+    # 常见的10的整数次幂精度只需一次quantize，省去除法和乘法
+    quantum = _decimal_quantum(precision)
+    if quantum is not None:
+        return value.quantize(quantum, rounding=rounding)
+        
+    return (value / precision).quantize(_ONE, rounding=rounding) * precision
 
-def safe_decimal(value, default=Decimal('0')) -> Decimal:
+def safe_decimal(value, default=_ZERO) -> Decimal:
     """
     安全地将值转换为Decimal
     
@@ -34,17 +90,22 @@ def safe_decimal(value, default=Decimal('0')) -> Decimal:
     Returns:
         转换后的Decimal值
     """
-    if isinstance(value, Decimal):
-        return value
-        
+    converter = _DECIMAL_CONVERTERS.get(type(value))
+    
     try:
-        if isinstance(value, (int, float)):
+        if converter is not None:
+            return converter(value)
+            
+        # 子类(如numpy.float64、IntEnum)不在分发表中，按基类处理
+        if isinstance(value, Decimal):
+            return value
+        elif isinstance(value, (int, float)):
             return Decimal(str(value))
         elif isinstance(value, str):
             return Decimal(value)
         else:
             return default
-    except:
+    except (InvalidOperation, ValueError):
         return default
 
 def get_current_timestamp() -> float:
@@ -67,9 +128,20 @@ def format_timestamp(timestamp: float, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
     Returns:
         格式化后的日期时间字符串
     """
-    dt = datetime.datetime.fromtimestamp(timestamp)
-    return dt.strftime(fmt)
+    # 含微秒的格式无法按秒缓存
+    if "%f" in fmt:
+        return datetime.datetime.fromtimestamp(timestamp).strftime(fmt)
+        
+    return _format_second(int(timestamp // 1), fmt)
 
+@lru_cache(maxsize=4096)
+def _format_second(second: int, fmt: str) -> str:
+    """
+    按整秒格式化时间戳，同一秒内的结果直接复用
+    """
+    return datetime.datetime.fromtimestamp(second).strftime(fmt)
+
+@lru_cache(maxsize=64)
 def parse_timeframe(timeframe: str) -> int:
     """
     解析时间周期字符串为秒数
@@ -80,31 +152,20 @@ def parse_timeframe(timeframe: str) -> int:
     Returns:
         时间周期的秒数
     """
+    seconds = _TIMEFRAME_TABLE.get(timeframe)
+    if seconds is not None:
+        return seconds
+        
+    # 不常见的周期再逐字符解析
     unit = timeframe[-1]
-    value = int(timeframe[:-1])
-    
-    if unit == 'm':
-        return value * 60  # 分钟
-    elif unit == 'h':
-        return value * 60 * 60  # 小时
-    elif unit == 'd':
-        return value * 60 * 60 * 24  # 天
-    elif unit == 'w':
-        return value * 60 * 60 * 24 * 7  # 周
-    else:
+    multiplier = _TIMEFRAME_UNITS.get(unit)
+    if multiplier is None:
         raise ValueError(f"不支持的时间周期单位: {unit}")
-
-def timeframe_to_seconds(timeframe: str) -> int:
-    """
-    将时间周期转换为秒数
-    
-    Args:
-        timeframe: 时间周期字符串，如 '1m', '5m', '1h', '1d'
         
-    Returns:
-        时间周期的秒数
-    """
-    return parse_timeframe(timeframe)
+    return int(timeframe[:-1]) * multiplier
+
+# 将时间周期转换为秒数，与parse_timeframe等价，直接复用以省去一层调用
+timeframe_to_seconds = parse_timeframe
 
 def calculate_price_precision(market_info: Dict) -> Decimal:
     """
@@ -116,8 +177,7 @@ def calculate_price_precision(market_info: Dict) -> Decimal:
     Returns:
         价格精度
     """
-    precision = market_info.get('precision', {}).get('price', 8)
-    return Decimal(f"0.{'0' * (precision - 1)}1")
+    return _precision_from_digits(market_info.get('precision', {}).get('price', 8))
 
 def calculate_amount_precision(market_info: Dict) -> Decimal:
     """
@@ -129,28 +189,24 @@ def calculate_amount_precision(market_info: Dict) -> Decimal:
     Returns:
         数量精度
     """
-    precision = market_info.get('precision', {}).get('amount', 8)
-    return Decimal(f"0.{'0' * (precision - 1)}1")
+    return _precision_from_digits(market_info.get('precision', {}).get('amount', 8))
 
 def is_rate_limited(last_time: float, rate_limit: float) -> Tuple[bool, float]:
     """
     检查是否受到速率限制
     
     Args:
-        last_time: 上次调用的时间戳
+        last_time: 上次调用的时间，取自time.monotonic()
         rate_limit: 速率限制(秒)
         
     Returns:
         (是否受限, 需要等待的时间)
     """
-    current_time = time.time()
-    elapsed = current_time - last_time
-    
-    if elapsed < rate_limit:
-        wait_time = rate_limit - elapsed
+    # 使用单调时钟，不受系统时间调整影响
+    wait_time = rate_limit - (time.monotonic() - last_time)
+    if wait_time > 0:
         return True, wait_time
-    
-    return False, 0
+    return False, 0.0
 
 def truncate_string(text: str, max_length: int = 100) -> str:
     """
@@ -224,11 +280,8 @@ def retry_async(max_retries: int = 3, delay: float = 1.0):
     
     Args:
         max_retries: 最大重试次数
-        delay: 重试延迟(秒)
+        delay: 首次重试延迟(秒)，之后按指数递增
     """
-    import asyncio
-    import functools
-    
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -241,8 +294,9 @@ def retry_async(max_retries: int = 3, delay: float = 1.0):
                     if retries > max_retries:
                         raise
                     
-                    wait_time = delay * retries
-                    logger.warning(f"{func.__name__} 失败，第 {retries} 次重试，等待 {wait_time} 秒: {e}")
+                    # 指数退避并加入少量随机抖动，避免多个调用同时重试
+                    wait_time = delay * (2 ** (retries - 1)) + random.random() * 0.1
+                    logger.warning("%s 失败，第 %d 次重试，等待 %.1f 秒: %s", func.__name__, retries, wait_time, e)
                     await asyncio.sleep(wait_time)
         
         return wrapper
@@ -3,15 +3,106 @@
 """
 import os
 import sys
+import time
+import queue
+import atexit
 import logging
 import logging.handlers
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import colorlog
 
 # 全局日志记录器字典
 _loggers = {}
 
+class _CachedTimeMixin:
+    """按秒缓存asctime的格式化结果，同一秒内的日志直接复用"""
+    
+    _cached_second = None
+    _cached_time = ""
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if not datefmt:
+            return super().formatTime(record, datefmt)
+            
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = time.strftime(datefmt, self.converter(second))
+            self._cached_second = second
+        return self._cached_time
+
+class _CachedTimeFormatter(_CachedTimeMixin, logging.Formatter):
+    """文件日志格式化器"""
+
+class _CachedTimeColoredFormatter(_CachedTimeMixin, colorlog.ColoredFormatter):
+    """控制台彩色日志格式化器"""
+
+# 日志记录器名称 -> 实际的处理器，由后台监听线程调用
+_handlers: Dict[str, Tuple[logging.Handler, ...]] = {}
+
+class _RoutingQueueListener(logging.handlers.QueueListener):
+    """从共享队列取出日志，按记录器名称分发给对应的处理器"""
+    
+    def handle(self, record: logging.LogRecord):
+        record = self.prepare(record)
+        for handler in _handlers.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+# 所有记录器共用一个队列和一个监听线程，保证日志按产生顺序写出
+_log_queue: queue.Queue = queue.Queue(-1)
+_listener: Optional[_RoutingQueueListener] = None
+
+def _start_listener():
+    """
+    启动后台监听线程(如果尚未启动)
+    """
+    global _listener
+    if _listener is None:
+        _listener = _RoutingQueueListener(_log_queue)
+        _listener.start()
+
+def _stop_listener():
+    """
+    停止监听线程，确保退出前队列中的日志全部写出
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(_stop_listener)
+
+def _get_handlers(name: str, logger: logging.Logger) -> Tuple[logging.Handler, ...]:
+    """
+    获取记录器实际使用的处理器
+    
+    Args:
+        name: 日志记录器名称
+        logger: 日志记录器
+        
+    Returns:
+        处理器元组
+    """
+    if name in _handlers:
+        return _handlers[name]
+    return tuple(logger.handlers)
+
+def _add_handler(name: str, logger: logging.Logger, handler: logging.Handler):
+    """
+    为记录器添加处理器，已使用队列的记录器添加到分发表中
+    
+    Args:
+        name: 日志记录器名称
+        logger: 日志记录器
+        handler: 要添加的处理器
+    """
+    if name in _handlers:
+        # 监听线程每条记录都会重新读取分发表，整体替换元组即可
+        _handlers[name] = _handlers[name] + (handler,)
+    else:
+        logger.addHandler(handler)
+
 def setup_logger(name: str = "girdbot", level: str = None, log_file: str = None) -> logging.Logger:
     """
     设置并配置日志记录器
@@ -50,7 +141,7 @@ def setup_logger(name: str = "girdbot", level: str = None, log_file: str = None)
     console_handler.setLevel(numeric_level)
     
     # 设置控制台彩色日志格式
-    console_formatter = colorlog.ColoredFormatter(
+    console_formatter = _CachedTimeColoredFormatter(
         "%(log_color)s%(asctime)s - %(levelname)s - %(name)s - %(message)s",
         log_colors={
             'DEBUG': 'cyan',
@@ -63,7 +154,7 @@ def setup_logger(name: str = "girdbot", level: str = None, log_file: str = None)
     )
     
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # 如果指定了日志文件，则添加文件处理器
     if log_file:
@@ -82,13 +173,19 @@ def setup_logger(name: str = "girdbot", level: str = None, log_file: str = None)
         file_handler.setLevel(numeric_level)
         
         # 设置文件日志格式
-        file_formatter = logging.Formatter(
+        file_formatter = _CachedTimeFormatter(
             '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # 记录器只负责入队，格式化和控制台/文件写入由监听器在后台线程完成，
+    # 避免同步I/O阻塞事件循环
+    _handlers[name] = tuple(handlers)
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _start_listener()
     
     # 保存记录器引用
     _loggers[name] = logger
@@ -129,7 +226,7 @@ def set_log_level(level: str, logger_name: Optional[str] = None):
         logger.setLevel(numeric_level)
         
         # 同时设置该记录器的所有处理器
-        for handler in logger.handlers:
+        for handler in _get_handlers(logger_name, logger):
             handler.setLevel(numeric_level)
     else:
         # 设置所有记录器的级别
@@ -137,7 +234,7 @@ def set_log_level(level: str, logger_name: Optional[str] = None):
             logger.setLevel(numeric_level)
             
             # 同时设置所有处理器
-            for handler in logger.handlers:
+            for handler in _get_handlers(name, logger):
                 handler.setLevel(numeric_level)
 
 def setup_file_logging(log_dir: str = "./logs"):
@@ -156,7 +253,7 @@ def setup_file_logging(log_dir: str = "./logs"):
         log_file = os.path.join(log_dir, f"{name}.log")
         
         # 检查记录器是否已有文件处理器
-        has_file_handler = any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+        has_file_handler = any(isinstance(h, logging.FileHandler) for h in _get_handlers(name, logger))
         if has_file_handler:
             continue
             
@@ -170,10 +267,10 @@ def setup_file_logging(log_dir: str = "./logs"):
         file_handler.setLevel(logger.level)
         
         # 设置文件日志格式
-        file_formatter = logging.Formatter(
+        file_formatter = _CachedTimeFormatter(
             '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
\ No newline at end of file
+        _add_handler(name, logger, file_handler)
\ No newline at end of file
@@ -1,16 +1,34 @@
 """
 API路由 - 定义Web服务的API路由
 """
+import os
 import json
 import time
+import hashlib
 from typing import Dict, Any, List
 
 from aiohttp import web
 
+from girdbot.storage.file_storage import FileStorage
 from girdbot.utils.logger import get_logger
 
 logger = get_logger("web_routes")
 
+# 单次请求最多返回的交易记录数
+_MAX_TRADES_LIMIT = 1000
+
+def _json_response(data: Any) -> web.Response:
+    """
+    构造JSON响应
+    
+    Args:
+        data: 响应数据
+        
+    Returns:
+        JSON响应
+    """
+    return web.Response(body=FileStorage.dumps(data), content_type='application/json')
+
 def setup_routes(app: web.Application, engine) -> None:
     """
     设置API路由
@@ -22,6 +40,18 @@ def setup_routes(app: web.Application, engine) -> None:
     # 存储引擎引用，供路由处理函数使用
     app["engine"] = engine
     
+    # 首页内容在启动时读入内存，请求时直接返回
+    # 读取失败时不影响服务启动，首页返回404
+    try:
+        static_dir = app.router['static'].get_info()['directory']
+        index_path = os.path.join(str(static_dir), 'index.html')
+        with open(index_path, 'rb') as f:
+            index_body = f.read()
+        app["index_html"] = (index_body, '"%s"' % hashlib.md5(index_body).hexdigest())
+    except Exception as e:
+        logger.error(f"读取首页文件失败: {e}")
+        app["index_html"] = None
+    
     # 添加路由
     app.router.add_get('/', index_handler)
     app.router.add_get('/api/status', status_handler)
@@ -31,10 +61,18 @@ def setup_routes(app: web.Application, engine) -> None:
 
 async def index_handler(request: web.Request) -> web.Response:
     """首页处理"""
-    index_path = request.app.router['static'].get_info()['directory'] + '/index.html'
-    with open(index_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    return web.Response(text=content, content_type='text/html')
+    index_html = request.app["index_html"]
+    if index_html is None:
+        raise web.HTTPNotFound()
+        
+    body, etag = index_html
+    headers = {'ETag': etag}
+    
+    # 浏览器缓存仍然有效时不再返回内容
+    if request.headers.get('If-None-Match') == etag:
+        return web.Response(status=304, headers=headers)
+        
+    return web.Response(body=body, content_type='text/html', charset='utf-8', headers=headers)
 
 async def status_handler(request: web.Request) -> web.Response:
     """系统状态API"""
@@ -48,7 +86,7 @@ async def status_handler(request: web.Request) -> web.Response:
         "grid_count": len(engine.grid_strategies),
     }
     
-    return web.json_response(status)
+    return _json_response(status)
 
 async def grids_handler(request: web.Request) -> web.Response:
     """网格策略状态API"""
@@ -58,24 +96,42 @@ async def grids_handler(request: web.Request) -> web.Response:
     if grid_id and grid_id in engine.grid_strategies:
         # 返回单个网格状态
         strategy = engine.grid_strategies[grid_id]
-        return web.json_response(strategy.get_status())
+        return _json_response(strategy.get_status())
     
     # 返回所有网格状态摘要
     grids = []
     for grid_id, strategy in engine.grid_strategies.items():
         grids.append(strategy.get_status(detailed=False))
     
-    return web.json_response({"grids": grids})
+    return _json_response({"grids": grids})
 
 async def trades_handler(request: web.Request) -> web.Response:
     """交易记录API"""
     engine = request.app["engine"]
     
     grid_id = request.query.get('grid_id')
-    limit = int(request.query.get('limit', 20))
+    try:
+        limit = int(request.query.get('limit', 20))
+    except ValueError:
+        raise web.HTTPBadRequest(text="limit必须为整数")
+    limit = max(0, min(limit, _MAX_TRADES_LIMIT))
+    
+    # 在发送响应头之前加载缓存，加载失败时仍能返回错误状态码
+    trades = await engine.trade_recorder.iter_recent_trades(grid_id, limit)
+    
+    # 逐条序列化并写出，不在内存中拼出完整的响应体
+    response = web.StreamResponse(headers={'Content-Type': 'application/json'})
+    await response.prepare(request)
+    
+    await response.write(b'{"trades":[')
+    separator = b''
+    for trade in trades:
+        await response.write(separator + FileStorage.dumps(trade))
+        separator = b','
+    await response.write(b']}')
     
-    trades = await engine.trade_recorder.get_recent_trades(grid_id, limit)
-    return web.json_response({"trades": trades})
+    await response.write_eof()
+    return response
 
 async def stats_handler(request: web.Request) -> web.Response:
     """统计数据API"""
@@ -88,12 +144,16 @@ async def stats_handler(request: web.Request) -> web.Response:
         strategy = engine.grid_strategies[grid_id]
         stats = strategy.get_stats()
     else:
-        # 返回全局统计
+        # 返回全局统计，每个策略只取一次统计数据
         stats = {
-            "total_profit": sum(s.get_stats()["total_profit"] for s in engine.grid_strategies.values()),
-            "total_trades": sum(s.get_stats()["total_trades"] for s in engine.grid_strategies.values()),
-            "active_orders": sum(s.get_stats()["active_orders"] for s in engine.grid_strategies.values()),
-            "filled_orders": sum(s.get_stats()["filled_orders"] for s in engine.grid_strategies.values()),
+            "total_profit": 0,
+            "total_trades": 0,
+            "active_orders": 0,
+            "filled_orders": 0,
         }
+        for strategy in engine.grid_strategies.values():
+            strategy_stats = strategy.get_stats()
+            for key in stats:
+                stats[key] += strategy_stats[key]
     
-    return web.json_response(stats)
\ No newline at end of file
+    return _json_response(stats)
\ No newline at end of file
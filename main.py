@@ -15,12 +15,16 @@ from girdbot.utils.logger import setup_logger
 # 全局变量
 engine = None
 web_runner = None
+stop_event = None  # 收到停止信号时置位，在main()中创建以绑定到运行中的事件循环
 logger = setup_logger()
 
 async def main():
     """主程序入口"""
     logger.info("启动 Girdbot_hedge 网格量化交易系统...")
     
+    global stop_event
+    stop_event = asyncio.Event()
+    
     try:
         # 加载配置
         config_path = os.environ.get("CONFIG_PATH", "config.yaml")
@@ -49,9 +53,9 @@ async def main():
         # 启动引擎
         await engine.start()
         
-        # 保持程序运行
-        while True:
-            await asyncio.sleep(1)
+        # 保持程序运行，直到收到停止信号
+        await stop_event.wait()
+        logger.info("收到停止信号，正在关闭系统...")
             
     except KeyboardInterrupt:
         logger.info("收到停止信号，正在关闭系统...")
@@ -82,31 +86,10 @@ async def main():
 def signal_handler(sig, frame):
     """处理系统信号"""
     logger.info(f"接收到信号 {sig}，准备关闭...")
-    if asyncio.get_event_loop().is_running():
-        asyncio.create_task(shutdown())
-
-async def shutdown():
-    """关闭所有系统组件"""
-    # 关闭Web服务器
-    global web_runner
-    if web_runner:
-        from girdbot.web.monitor_server import stop_web_monitor
-        await stop_web_monitor(web_runner)
-    
-    # 关闭引擎
-    global engine
-    if engine:
-        await engine.shutdown()
-    
-    # 确保所有异步任务完成，但设置5秒超时
-    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
-    if tasks:
-        logger.info(f"等待 {len(tasks)} 个异步任务完成（最多5秒）...")
-        try:
-            await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=5.0)
-            logger.info("所有异步任务已完成")
-        except asyncio.TimeoutError:
-            logger.warning("等待异步任务超时，强制退出")
+    loop = asyncio.get_event_loop()
+    if stop_event is not None and loop.is_running():
+        # 唤醒main()，由其finally块统一完成关闭流程
+        loop.call_soon_threadsafe(stop_event.set)
 
 if __name__ == "__main__":
     # 注册信号处理
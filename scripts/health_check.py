@@ -35,6 +35,9 @@ except ImportError:
 # 设置日志
 logger = setup_logger("health_check")
 
+# 复用HTTP连接，多次检查时省去重复的TCP握手
+_SESSION = requests.Session()
+
 def parse_arguments():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(description='Girdbot健康检查脚本')
@@ -49,9 +52,23 @@ def parse_arguments():
 def check_process_running(process_name="python main.py"):
     """检查进程是否运行"""
     try:
-        import subprocess
-        output = subprocess.check_output(["ps", "aux"], text=True)
-        return process_name in output
+        import psutil
+    except ImportError:
+        psutil = None
+        
+    try:
+        if psutil is None:
+            # 未安装psutil时回退到解析ps输出
+            import subprocess
+            output = subprocess.check_output(["ps", "aux"], text=True)
+            return process_name in output
+            
+        # 直接读取各进程的命令行，无需创建子进程
+        for proc in psutil.process_iter(['cmdline']):
+            cmdline = proc.info['cmdline']
+            if cmdline and process_name in ' '.join(cmdline):
+                return True
+        return False
     except Exception as e:
         logger.error(f"检查进程运行状态时出错: {e}")
         return False
@@ -59,7 +76,7 @@ def check_process_running(process_name="python main.py"):
 def check_web_server(host="127.0.0.1", port=8080):
     """检查Web服务器是否可访问"""
     try:
-        response = requests.get(f"http://{host}:{port}/api/status", timeout=5)
+        response = _SESSION.get(f"http://{host}:{port}/api/status", timeout=5)
         if response.status_code == 200:
             status = response.json()
             return True, status
@@ -0,0 +1,101 @@
+"""
+网格状态管理测试
+"""
+import pytest
+
+from girdbot.storage import file_storage
+from girdbot.storage.grid_state import GridStateManager
+
+
+@pytest.fixture(params=["orjson", "json"])
+def manager(request, tmp_path, monkeypatch):
+    """分别使用orjson和标准库json编码的状态管理器，关闭保存频率限制"""
+    if request.param == "json":
+        monkeypatch.setattr(file_storage, "orjson", None)
+    elif file_storage.orjson is None:
+        pytest.skip("orjson未安装")
+
+    manager = GridStateManager(str(tmp_path))
+    manager._save_interval = 0
+    return manager
+
+
+def _count_writes(manager):
+    writes = []
+    save_bytes_sync = manager.storage.save_bytes_sync
+
+    def counting_save_bytes_sync(filename, payload):
+        writes.append(filename)
+        return save_bytes_sync(filename, payload)
+
+    manager.storage.save_bytes_sync = counting_save_bytes_sync
+    return writes
+
+
+def test_save_empty_state(manager):
+    assert manager.save_grid_state("s1", {})
+
+    state = manager.load_grid_state("s1")
+    assert list(state) == ["_last_saved"]
+    assert isinstance(state["_last_saved"], float)
+
+
+def test_save_volatile_only_state(manager):
+    assert manager.save_grid_state("s1", {"last_update": 123.5})
+
+    state = manager.load_grid_state("s1")
+    assert state.pop("_last_saved")
+    assert state == {"last_update": 123.5}
+
+
+def test_save_state_round_trip(manager):
+    assert manager.save_grid_state("s1", {
+        "symbol": "BTC/USDT",
+        "levels": {1: "buy", 2.5: "sell"},
+        7: [1, 2],
+        "last_update": 100,
+    })
+
+    state = manager.load_grid_state("s1")
+    assert state.pop("_last_saved")
+    assert state == {
+        "symbol": "BTC/USDT",
+        "levels": {"1": "buy", "2.5": "sell"},
+        "7": [1, 2],
+        "last_update": 100,
+    }
+
+
+def test_unchanged_state_is_not_rewritten(manager):
+    writes = _count_writes(manager)
+    state = {"symbol": "BTC/USDT", "levels": [1, 2, 3], "last_update": 100}
+
+    assert manager.save_grid_state("s1", state)
+    assert manager.save_grid_state("s1", dict(state))
+    assert writes == ["s1.json"]
+
+
+def test_last_update_change_alone_is_not_rewritten(manager):
+    writes = _count_writes(manager)
+
+    assert manager.save_grid_state("s1", {"levels": [1, 2], "last_update": 100})
+    assert manager.save_grid_state("s1", {"levels": [1, 2], "last_update": 200})
+    assert writes == ["s1.json"]
+    assert manager.load_grid_state("s1")["last_update"] == 100
+
+    # 非易变字段变化时正常写入
+    assert manager.save_grid_state("s1", {"levels": [1, 2, 3], "last_update": 300})
+    assert writes == ["s1.json", "s1.json"]
+    state = manager.load_grid_state("s1")
+    assert state["levels"] == [1, 2, 3]
+    assert state["last_update"] == 300
+
+
+def test_save_interval_limits_writes(tmp_path):
+    manager = GridStateManager(str(tmp_path))
+    writes = _count_writes(manager)
+
+    assert manager.save_grid_state("s1", {"levels": [1]})
+    assert manager.save_grid_state("s1", {"levels": [2]})
+    assert writes == ["s1.json"]
+    assert manager.load_grid_state("s1")["levels"] == [1]
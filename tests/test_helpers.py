@@ -0,0 +1,55 @@
+"""
+工具函数测试
+"""
+from decimal import Decimal, ROUND_DOWN, ROUND_UP
+
+import pytest
+
+from girdbot.utils.helpers import round_to_precision
+
+VALUES = ["123.456789", "0.000123456", "99999.99999", "7", "0", "-123.456789", "-0.001", "1234.5"]
+TICKS = ["0.01", "1E-8", "0.00000001", "1", "10", "100", "1E+3", "0.5", "0.25", "5"]
+
+
+def _reference(value: Decimal, precision: Decimal, rounding) -> Decimal:
+    """快速路径引入之前的计算方式"""
+    return (value / precision).quantize(Decimal(1), rounding=rounding) * precision
+
+
+@pytest.mark.parametrize("rounding", [ROUND_DOWN, ROUND_UP])
+@pytest.mark.parametrize("tick", TICKS)
+@pytest.mark.parametrize("value", VALUES)
+def test_round_to_precision_matches_reference(value, tick, rounding):
+    value, precision = Decimal(value), Decimal(tick)
+    result = round_to_precision(value, precision, rounding)
+    expected = _reference(value, precision, rounding)
+
+    assert result == expected
+    # 表示形式也需一致，精度为10及以上时不能变成科学计数法
+    assert str(result) == str(expected)
+
+
+@pytest.mark.parametrize("value, tick, rounding, expected", [
+    ("123.456", "0.01", ROUND_DOWN, "123.45"),
+    ("123.451", "0.01", ROUND_UP, "123.46"),
+    ("-123.456", "0.01", ROUND_DOWN, "-123.45"),
+    ("-123.451", "0.01", ROUND_UP, "-123.46"),
+    ("0.123456789", "1E-8", ROUND_DOWN, "0.12345678"),
+    ("0.123456781", "1E-8", ROUND_UP, "0.12345679"),
+    ("123.9", "1", ROUND_DOWN, "123"),
+    ("123.1", "1", ROUND_UP, "124"),
+    ("123", "10", ROUND_DOWN, "120"),
+    ("121", "10", ROUND_UP, "130"),
+    ("-121", "10", ROUND_UP, "-130"),
+    ("1.7", "0.5", ROUND_DOWN, "1.5"),
+    ("1.7", "0.5", ROUND_UP, "2.0"),
+    ("-1.7", "0.5", ROUND_DOWN, "-1.5"),
+])
+def test_round_to_precision_values(value, tick, rounding, expected):
+    result = round_to_precision(Decimal(value), Decimal(tick), rounding)
+    assert str(result) == expected
+    assert str(result) == str(_reference(Decimal(value), Decimal(tick), rounding))
+
+
+def test_round_to_precision_zero_tick():
+    assert round_to_precision(Decimal("1.234"), Decimal("0")) == Decimal("1.234")
@@ -0,0 +1,148 @@
+"""
+交易记录器测试
+"""
+import asyncio
+from decimal import Decimal
+
+from girdbot.storage.trade_recorder import TradeRecorder
+
+
+def test_record_trade_during_async_cache_load_is_kept(tmp_path):
+    """异步加载缓存期间同步记录的交易不能被加载结果覆盖"""
+    recorder = TradeRecorder(str(tmp_path))
+    recorder.record_trade("s1", "o1", "BTC/USDT", "buy", Decimal("100"), Decimal("1"), 1.0)
+    asyncio.run(recorder.flush())
+
+    # 新的记录器从磁盘加载，在读取快照的等待期间记录一笔新交易
+    recorder = TradeRecorder(str(tmp_path))
+    load_json = recorder.storage.load_json
+
+    async def load_json_with_fill(filename):
+        data = await load_json(filename)
+        recorder.record_trade("s1", "o2", "BTC/USDT", "sell", Decimal("110"), Decimal("1"), 2.0)
+        return data
+
+    recorder.storage.load_json = load_json_with_fill
+
+    async def run():
+        trades = await recorder.get_trades_by_strategy("s1")
+        await recorder.close()
+        return trades
+
+    trades = asyncio.run(run())
+
+    assert [t["order_id"] for t in trades] == ["o1", "o2"]
+    assert len(recorder._by_order_id["o1"]) == 1
+    assert recorder._totals["s1"]["sell_volume"] == Decimal("1")
+
+    # 压缩后重新加载，两笔交易都应保留
+    assert recorder.compact("s1")
+    reloaded = TradeRecorder(str(tmp_path))
+    trades = asyncio.run(reloaded.get_trades_by_strategy("s1"))
+    assert [t["order_id"] for t in trades] == ["o1", "o2"]
+
+
+def _record_buys(recorder, strategy_id, count, start=0):
+    for i in range(start, start + count):
+        recorder.record_trade(strategy_id, f"o{i}", "BTC/USDT", "buy", Decimal("100"), Decimal("1"), float(i))
+
+
+def _reload(tmp_path, strategy_id):
+    recorder = TradeRecorder(str(tmp_path))
+    trades = asyncio.run(recorder.get_trades_by_strategy(strategy_id))
+    return recorder, trades
+
+
+def test_compact_with_failed_log_delete_does_not_duplicate(tmp_path):
+    """快照写入后删除日志失败，重新加载时不能重复重放日志"""
+    recorder = TradeRecorder(str(tmp_path))
+    _record_buys(recorder, "s1", 3)
+    recorder.storage.delete_file = lambda filename: False
+
+    assert recorder.compact("s1")
+    assert (tmp_path / "trades" / "s1_trades.log").exists()
+
+    reloaded, trades = _reload(tmp_path, "s1")
+    assert [t["order_id"] for t in trades] == ["o0", "o1", "o2"]
+    assert reloaded._totals["s1"]["buy_volume"] == Decimal("3")
+
+    # 删除失败后的新交易写入新一代日志，不会丢失也不会重复
+    _record_buys(recorder, "s1", 2, start=3)
+    reloaded, trades = _reload(tmp_path, "s1")
+    assert [t["order_id"] for t in trades] == ["o0", "o1", "o2", "o3", "o4"]
+    assert reloaded._totals["s1"]["buy_volume"] == Decimal("5")
+
+    # 下一次压缩会清理残留的旧日志
+    del recorder.storage.delete_file
+    assert recorder.compact("s1")
+    assert sorted(p.name for p in (tmp_path / "trades").iterdir()) == ["s1_trades.json"]
+    _, trades = _reload(tmp_path, "s1")
+    assert len(trades) == 5
+
+
+def test_compact_with_failed_snapshot_write_keeps_log(tmp_path):
+    """快照写入失败时旧快照和日志仍然有效"""
+    recorder = TradeRecorder(str(tmp_path))
+    _record_buys(recorder, "s1", 2)
+    assert recorder.compact("s1")
+    _record_buys(recorder, "s1", 2, start=2)
+
+    save_json_sync = recorder.storage.save_json_sync
+    recorder.storage.save_json_sync = lambda filename, data: False
+    assert not recorder.compact("s1")
+    _record_buys(recorder, "s1", 1, start=4)
+
+    reloaded, trades = _reload(tmp_path, "s1")
+    assert [t["order_id"] for t in trades] == ["o0", "o1", "o2", "o3", "o4"]
+    assert reloaded._totals["s1"]["buy_volume"] == Decimal("5")
+
+    recorder.storage.save_json_sync = save_json_sync
+    assert recorder.compact("s1")
+    _, trades = _reload(tmp_path, "s1")
+    assert len(trades) == 5
+
+
+def test_legacy_list_snapshot_is_loaded(tmp_path):
+    """旧版本的列表快照仍按快照加日志的方式加载"""
+    recorder = TradeRecorder(str(tmp_path))
+    _record_buys(recorder, "s1", 1)
+    legacy = recorder.trades_cache["s1"]
+    recorder.storage.save_json_sync("s1_trades.json", legacy)
+    recorder.storage.delete_file("s1_trades.log")
+    _record_buys(recorder, "s1", 2, start=1)
+
+    reloaded, trades = _reload(tmp_path, "s1")
+    assert [t["order_id"] for t in trades] == ["o0", "o1", "o2"]
+    assert reloaded._totals["s1"]["buy_volume"] == Decimal("3")
+
+
+def test_auto_compaction_writes_snapshot_off_the_event_loop(tmp_path):
+    """日志达到阈值后在后台线程写入快照，新交易继续写入新一代日志"""
+    import threading
+
+    recorder = TradeRecorder(str(tmp_path))
+    recorder._compact_threshold = 3
+    recorder._flush_interval = 0
+    save_json_sync = recorder.storage.save_json_sync
+    snapshot_threads = []
+
+    def save_json_sync_in_thread(filename, data):
+        snapshot_threads.append(threading.current_thread())
+        return save_json_sync(filename, data)
+
+    recorder.storage.save_json_sync = save_json_sync_in_thread
+
+    async def run():
+        _record_buys(recorder, "s1", 3)
+        await asyncio.sleep(0.01)
+        _record_buys(recorder, "s1", 2, start=3)
+        await recorder.close()
+
+    asyncio.run(run())
+
+    assert snapshot_threads and threading.main_thread() not in snapshot_threads
+    assert (tmp_path / "trades" / "s1_trades.log.1").exists()
+    assert not (tmp_path / "trades" / "s1_trades.log").exists()
+    reloaded, trades = _reload(tmp_path, "s1")
+    assert [t["order_id"] for t in trades] == ["o0", "o1", "o2", "o3", "o4"]
+    assert reloaded._totals["s1"]["buy_volume"] == Decimal("5")
@@ -0,0 +1,60 @@
+"""
+Web接口测试
+"""
+import asyncio
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from girdbot.storage.trade_recorder import TradeRecorder
+from girdbot.web.routes import trades_handler
+
+
+def _get_trades(recorder, query):
+    async def run():
+        app = web.Application()
+        app["engine"] = SimpleNamespace(trade_recorder=recorder)
+        app.router.add_get("/api/trades", trades_handler)
+        async with TestClient(TestServer(app)) as client:
+            response = await client.get("/api/trades", params=query)
+            return response.status, await response.text()
+
+    return asyncio.run(run())
+
+
+def _recorder_with_trades(tmp_path, count):
+    recorder = TradeRecorder(str(tmp_path))
+    for i in range(count):
+        recorder.record_trade("s1", f"o{i}", "BTC/USDT", "buy", Decimal("100"), Decimal("1"), float(i))
+    return TradeRecorder(str(tmp_path))
+
+
+def test_trades_limit(tmp_path):
+    recorder = _recorder_with_trades(tmp_path, 3)
+
+    status, body = _get_trades(recorder, {"grid_id": "s1", "limit": "2"})
+    assert status == 200
+    assert [t["order_id"] for t in json.loads(body)["trades"]] == ["o2", "o1"]
+
+    for limit in ("0", "-5"):
+        status, body = _get_trades(recorder, {"limit": limit})
+        assert status == 200
+        assert json.loads(body) == {"trades": []}
+
+    status, _ = _get_trades(recorder, {"limit": "abc"})
+    assert status == 400
+
+
+def test_trades_cache_load_error_returns_500(tmp_path):
+    recorder = _recorder_with_trades(tmp_path, 1)
+
+    async def failing_load(strategy_id):
+        raise OSError("disk error")
+
+    recorder._ensure_cache_initialized = failing_load
+
+    status, _ = _get_trades(recorder, {"grid_id": "s1"})
+    assert status == 500